@@ -13,13 +13,7 @@ Date,Time1,Height1,Time2,Height2,Time3,Height3,Time4,Height4
 
 Output JSON format:
 [
-  {
-    "Date": "2025-12-01",
-    "00:00": 1.5,
-    "01:00": 1.3,
-    ...
-    "23:00": 1.4
-  },
+  {"Date":"2025-12-01","00:00":1.5,"01:00":1.3,...,"23:00":1.4},
   ...
 ]
 
@@ -31,56 +25,126 @@ import csv
 import json
 import math
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from orjson import dumps as json_dumps
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+HOUR_KEYS = tuple(f"{h:02d}:00" for h in range(24))
 
 def parse_csv_to_extrema(csv_file):
     """
-    Parse CSV file to list of tide extrema.
+    Parse CSV file to tide extrema.
+
+    Cells are collected as strings; times and heights are then converted
+    in one vectorized pass and each date is parsed once.
+
+    Raises:
+        ValueError: If a date, time (HHMM) or height cell is invalid
 
     Returns:
-        List of extrema: [{"time": datetime, "height": float}, ...]
+        Tuple of (times, heights) arrays sorted by time: datetime64[s]
+        times and float64 heights in meters
     """
-    extrema = []
+    date_vals = []     # one per row with extrema
+    extrema_rows = []  # index into date_vals for each extrema
+    time_cols = []     # column name of each extrema time, for errors
+    time_vals = []
+    height_vals = []
 
     with open(csv_file, 'r') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+
+        # Resolve column positions once from the header
+        header = next(reader, [])
+        date_idx = header.index('Date')
+        pair_idx = [
+            (header.index(f'Time{i}'), header.index(f'Height{i}'))
+            for i in range(1, 5)
+            if f'Time{i}' in header and f'Height{i}' in header
+        ]
 
         for row in reader:
-            date_str = row['Date']
+            # Skip blank lines
+            if not row:
+                continue
+
+            date_str = row[date_idx]
 
             # Skip example rows
             if date_str.startswith('EXAMPLE'):
                 continue
 
-            # Parse each extrema (up to 4 per day)
-            for i in range(1, 5):
-                time_key = f'Time{i}'
-                height_key = f'Height{i}'
+            # Pad short rows so trailing empty extrema can be indexed
+            if len(row) < len(header):
+                row += [''] * (len(header) - len(row))
 
-                time_val = row.get(time_key, '').strip()
-                height_val = row.get(height_key, '').strip()
+            # Collect each extrema (up to 4 per day)
+            row_count = len(time_vals)
+            for time_idx, height_idx in pair_idx:
+                time_val = row[time_idx].strip()
+                height_val = row[height_idx].strip()
 
                 if time_val and height_val:
-                    # Parse time (HHMM format)
-                    hour = int(time_val[:2])
-                    minute = int(time_val[2:])
+                    extrema_rows.append(len(date_vals))
+                    time_cols.append(header[time_idx])
+                    time_vals.append(time_val)
+                    height_vals.append(height_val)
+
+            # Each date is parsed once, however many extrema it has
+            if len(time_vals) > row_count:
+                date_vals.append(date_str)
+
+    # Parse times (HHMM format), rejecting out-of-range hours or minutes
+    hhmm = np.array(time_vals, dtype=str).astype(np.int64)
+    bad = np.flatnonzero((hhmm < 0) | (hhmm // 100 >= 24) | (hhmm % 100 >= 60))
+    if bad.size:
+        i = bad[0]
+        raise ValueError(
+            f"{date_vals[extrema_rows[i]]} {time_cols[i]}: invalid time '{time_vals[i]}'"
+        )
+    minutes = (hhmm // 100) * 60 + hhmm % 100
+
+    # Parse each unique date once with strptime (accepts e.g. 2025-12-1)
+    parsed = {d: datetime.strptime(d, '%Y-%m-%d').date() for d in set(date_vals)}
+    dates = np.array([parsed[d] for d in date_vals], dtype='datetime64[D]')
+    dates = dates[np.array(extrema_rows, dtype=np.intp)]
+
+    times = (dates + minutes.astype('timedelta64[m]')).astype('datetime64[s]')
+    heights = np.array(height_vals, dtype=str).astype(float)
 
-                    # Create datetime object
-                    dt = datetime.strptime(date_str, '%Y-%m-%d')
-                    dt = dt.replace(hour=hour, minute=minute)
+    # Sort by time
+    order = np.argsort(times, kind='stable')
 
-                    # Parse height
-                    height = float(height_val)
+    return times[order], heights[order]
 
-                    extrema.append({
-                        'time': dt,
-                        'height': height
-                    })
+def tide_height_batch(t, t0, h0, t1, h1):
+    """
+    Half-sine interpolation between consecutive extrema, over whole arrays.
 
-    # Sort by time
-    extrema.sort(key=lambda x: x['time'])
+    Args:
+        t: Times to calculate tide for (seconds)
+        t0: Times of previous extrema (seconds)
+        h0: Heights at previous extrema
+        t1: Times of next extrema (seconds)
+        h1: Heights at next extrema
 
-    return extrema
+    Returns:
+        Array of interpolated tide heights in meters
+    """
+    # Calculate position between extrema (0 to 1)
+    span = np.where(t1 > t0, t1 - t0, 1)
+    x = np.clip((t - t0) / span, 0, 1)
+
+    # Half-sine interpolation
+    s = 0.5 * (1 + np.sin(np.pi * x - np.pi / 2))
+
+    return h0 + (h1 - h0) * s
 
 def tide_height_between(t, t0, h0, t1, h1):
     """
@@ -96,84 +160,97 @@ def tide_height_between(t, t0, h0, t1, h1):
     Returns:
         Interpolated tide height in meters
     """
-    if t <= t0:
-        return h0
-    if t >= t1:
-        return h1
+    return float(tide_height_batch(
+        (t - t0).total_seconds(), 0.0, h0, (t1 - t0).total_seconds(), h1
+    ))
 
-    # Calculate position between extrema (0 to 1)
-    x = (t - t0).total_seconds() / (t1 - t0).total_seconds()
-
-    # Half-sine interpolation
-    s = 0.5 * (1 + math.sin(math.pi * x - math.pi / 2))
-
-    return h0 + (h1 - h0) * s
-
-def generate_hourly_tides(extrema):
+def generate_hourly_tides(times, heights):
     """
     Generate hourly tide levels from extrema data.
 
+    All hours are interpolated in one vectorized pass; the bracketing
+    extrema pair for each hour is found with np.searchsorted.
+
     Args:
-        extrema: List of tide extrema with 'time' and 'height' keys
+        times: Sorted datetime64[s] array of tide extrema times
+        heights: Array of tide extrema heights
 
     Returns:
-        List of daily tide data dictionaries
+        Tuple of (dates, levels): list of YYYY-MM-DD strings and a
+        (days, 24) array of levels rounded to 1 decimal place, with NaN
+        for hours outside the extrema range
     """
-    # Group by date
-    daily_data = {}
-
-    # Determine date range
-    start = extrema[0]['time'].replace(hour=0, minute=0, second=0, microsecond=0)
-    end = extrema[-1]['time'].replace(hour=23, minute=0, second=0, microsecond=0)
-
-    # Generate hourly data
-    t = start
-    while t <= end:
-        date_str = t.strftime("%Y-%m-%d")
-        hour_str = t.strftime("%H:00")
-
-        # Find the interpolated height for this hour
-        for i in range(len(extrema) - 1):
-            t0, h0 = extrema[i]['time'], extrema[i]['height']
-            t1, h1 = extrema[i + 1]['time'], extrema[i + 1]['height']
-
-            if t0 <= t <= t1:
-                ht = tide_height_between(t, t0, h0, t1, h1)
-
-                # Initialize day if needed
-                if date_str not in daily_data:
-                    daily_data[date_str] = {"Date": date_str}
-
-                # Round to 1 decimal place
-                daily_data[date_str][hour_str] = round(ht, 1)
-                break
-
-        t += timedelta(hours=1)
+    if len(times) < 2:
+        return [], np.empty((0, 24))
+
+    # Extrema times as int64 epoch seconds for arithmetic
+    t_arr = times.astype(np.int64)
+
+    # Only hours covered by the extrema can be interpolated: from the first
+    # whole hour at or after the first extremum to the last one at or before
+    # the last extremum
+    first_hour = -(-t_arr[0] // 3600) * 3600
+    last_hour = t_arr[-1] // 3600 * 3600
+    hour_secs = np.arange(first_hour, last_hour + 1, 3600)
+    if hour_secs.size == 0:
+        return [], np.empty((0, 24))
+
+    # Index of the extrema pair bracketing each hour; hours never precede
+    # the first extremum, so only the last one needs clamping
+    idx = np.searchsorted(t_arr, hour_secs, side='right') - 1
+    idx = np.minimum(idx, len(t_arr) - 2)
+
+    hourly = tide_height_batch(
+        hour_secs, t_arr[idx], heights[idx], t_arr[idx + 1], heights[idx + 1]
+    )
+
+    # Round to 1 decimal place (builtin round, to match the JSON values)
+    hourly = np.array([round(ht, 1) for ht in hourly.tolist()])
+
+    # Scatter into a (days, 24) array
+    day_nums = hour_secs // 86400
+    first_day = day_nums[0]
+    n_days = day_nums[-1] - first_day + 1
+
+    levels = np.full((n_days, 24), np.nan)
+    levels[day_nums - first_day, hour_secs // 3600 % 24] = hourly
+
+    days = np.arange(first_day, first_day + n_days).astype('datetime64[D]')
+    return days.astype(str).tolist(), levels
+
+def validate_output(dates, levels):
+    """Validate the generated (days, 24) tide levels."""
+    issues = []
 
-    # Convert to list format (sorted by date)
-    return [daily_data[date] for date in sorted(daily_data.keys())]
+    # Check all 24 hours are present
+    hours_present = np.count_nonzero(~np.isnan(levels), axis=1)
 
-def validate_output(daily_tides):
-    """Validate the generated tide data."""
-    issues = []
+    # Check tide levels are in reasonable range (-0.5 to 4m for Singapore)
+    unusual = (levels < -0.5) | (levels > 4)
 
-    for day in daily_tides:
-        date = day.get("Date")
+    for i in np.flatnonzero((hours_present != 24) | unusual.any(axis=1)):
+        date = dates[i]
 
-        # Check all 24 hours are present
-        hours_present = len([k for k in day.keys() if k != "Date"])
-        if hours_present != 24:
-            issues.append(f"{date}: Only {hours_present}/24 hours present")
+        if hours_present[i] != 24:
+            issues.append(f"{date}: Only {hours_present[i]}/24 hours present")
 
-        # Check tide levels are in reasonable range (-0.5 to 4m for Singapore)
-        for hour_str, level in day.items():
-            if hour_str == "Date":
-                continue
-            if not (-0.5 <= level <= 4):
-                issues.append(f"{date} {hour_str}: Unusual tide level {level}m")
+        for h in np.flatnonzero(unusual[i]):
+            issues.append(f"{date} {HOUR_KEYS[h]}: Unusual tide level {float(levels[i, h])}m")
 
     return issues
 
+def write_daily_tides(output_json, dates, levels):
+    """Write one JSON record per day straight from the levels array."""
+    with open(output_json, 'wb') as f:
+        f.write(b'[\n')
+        for i, (date, row) in enumerate(zip(dates, levels.tolist())):
+            record = {"Date": date}
+            record.update(
+                (key, level) for key, level in zip(HOUR_KEYS, row) if not math.isnan(level)
+            )
+            f.write((b',\n  ' if i else b'  ') + json_dumps(record))
+        f.write(b'\n]\n')
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python convert_tide_data.py input.csv output.json")
@@ -188,24 +265,24 @@ def main():
 
     # Step 1: Parse CSV to extrema
     print(f"📖 Reading CSV file: {input_csv}")
-    extrema = parse_csv_to_extrema(input_csv)
-    print(f"✅ Loaded {len(extrema)} tide extrema")
+    times, heights = parse_csv_to_extrema(input_csv)
+    print(f"✅ Loaded {len(times)} tide extrema")
 
-    if extrema:
-        first_time = extrema[0]['time']
-        last_time = extrema[-1]['time']
-        print(f"📅 Date range: {first_time.date()} to {last_time.date()}")
+    if len(times):
+        first_date = times[0].astype('datetime64[D]')
+        last_date = times[-1].astype('datetime64[D]')
+        print(f"📅 Date range: {first_date} to {last_date}")
         print()
 
     # Step 2: Generate hourly tides
     print(f"🔄 Generating hourly tide data...")
-    daily_tides = generate_hourly_tides(extrema)
-    print(f"✅ Generated {len(daily_tides)} days of hourly data")
+    dates, levels = generate_hourly_tides(times, heights)
+    print(f"✅ Generated {len(dates)} days of hourly data")
     print()
 
     # Step 3: Validate output
     print(f"🔍 Validating output...")
-    issues = validate_output(daily_tides)
+    issues = validate_output(dates, levels)
     if issues:
         print(f"⚠️  Found {len(issues)} validation issues:")
         for issue in issues[:10]:
@@ -218,15 +295,14 @@ def main():
 
     # Step 4: Write output
     print(f"💾 Writing to {output_json}...")
-    with open(output_json, 'w') as f:
-        json.dump(daily_tides, f, indent=2)
+    write_daily_tides(output_json, dates, levels)
 
     print()
     print("=" * 60)
     print("🎉 SUCCESS!")
     print("=" * 60)
-    print(f"📊 Generated: {len(daily_tides)} days of tide data")
-    print(f"📁 Total hourly records: {len(daily_tides) * 24}")
+    print(f"📊 Generated: {len(dates)} days of tide data")
+    print(f"📁 Total hourly records: {len(dates) * 24}")
     print(f"📄 Output file: {output_json}")
     print()
     print("📝 Next step:")
@@ -7,70 +7,146 @@ Automatically detects single month or multi-month data and formats accordingly.
 - Multiple months: 1 page per month
 
 Usage:
-    python generate_tide_pdf.py input.json output.pdf [location]
+    python generate_tide_pdf.py input.json output.pdf [location] [--parallel]
 
 Arguments:
     input.json  - JSON file from convert_tide_data.py
     output.pdf  - Output PDF filename
     location    - Optional location name (default: "TANJONG PAGAR")
+    --parallel  - Build changed months in parallel worker processes
 """
 
-import json
+import hashlib
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from itertools import groupby
+from pypdf import PdfWriter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+try:
+    import json_stream
+except ImportError:
+    json_stream = None
+
+# Bump when the page layout or styles change, so cached month pages are rebuilt
+LAYOUT_VERSION = 1
+
+HOUR_KEYS = tuple(f'{h:02d}:00' for h in range(24))
+HEADER = ['Day'] + [f'{h:02d}' for h in range(24)]
+MONTH_NAMES = {
+    '01': 'JANUARY', '02': 'FEBRUARY', '03': 'MARCH', '04': 'APRIL',
+    '05': 'MAY', '06': 'JUNE', '07': 'JULY', '08': 'AUGUST',
+    '09': 'SEPTEMBER', '10': 'OCTOBER', '11': 'NOVEMBER', '12': 'DECEMBER'
+}
+
+# Styles, shared by every month
+_styles = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_styles['Heading1'],
+    fontSize=12,
+    textColor=colors.black,
+    spaceAfter=3,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+SUBTITLE_STYLE = ParagraphStyle(
+    'CustomSubtitle',
+    parent=_styles['Normal'],
+    fontSize=9,
+    textColor=colors.black,
+    spaceAfter=6,
+    alignment=TA_CENTER,
+    fontName='Helvetica'
+)
+
+FOOTER_STYLE = ParagraphStyle('Footer', fontSize=6.5, textColor=colors.grey, alignment=TA_CENTER)
+
+# Column widths for portrait A4
+PAGE_WIDTH = A4[0] - 10*mm  # Total width minus margins
+DAY_COL_WIDTH = 8*mm
+HOUR_COL_WIDTH = (PAGE_WIDTH - DAY_COL_WIDTH) / 24
+COL_WIDTHS = [DAY_COL_WIDTH] + [HOUR_COL_WIDTH] * 24
+
+# Table styling
+TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 6.5),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 1),
+    ('TOPPADDING', (0, 0), (-1, 0), 1),
+
+    # Day column
+    ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
+    ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 1), (0, -1), 6),
+
+    # Data cells
+    ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (1, 1), (-1, -1), 6),
+    ('TOPPADDING', (1, 1), (-1, -1), 0.8),
+    ('BOTTOMPADDING', (1, 1), (-1, -1), 0.8),
+
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 0.3, colors.grey),
+    ('LINEBELOW', (0, 0), (-1, 0), 0.8, colors.black),
+    ('LINEAFTER', (0, 0), (0, -1), 0.8, colors.black),
+])
+
 def load_tide_data(filename):
-    """Load tide data from JSON file."""
-    with open(filename, 'r') as f:
-        return json.load(f)
-
-def group_by_month(tide_data):
-    """Group tide data by year-month."""
-    months = {}
-    for day in tide_data:
-        date = day['Date']
-        year_month = date[:7]  # YYYY-MM
-        if year_month not in months:
-            months[year_month] = []
-        months[year_month].append(day)
-    return months
+    """
+    Iterate over the daily records in a tide data JSON file.
+
+    Records are parsed lazily with json-stream when it is installed;
+    otherwise the whole file is loaded at once.
+    """
+    with open(filename, 'rb') as f:
+        if json_stream is None:
+            yield from json_loads(f.read())
+        else:
+            for day in json_stream.load(f):
+                yield json_stream.to_standard_types(day)
 
 def create_month_table(month_data):
     """Create a table for one month."""
     # Header row: Day, then hours 00-23
-    header = ['Day'] + [f'{h:02d}' for h in range(24)]
-
-    # Data rows
-    data = [header]
+    data = [HEADER]
 
+    # Data rows: day number, then tide levels (1 decimal place) for each hour
     for day_data in month_data:
-        date = day_data['Date']
-        day = int(date.split('-')[2])
-
-        # Row: day number, then tide levels for each hour
-        row = [str(day)]
-        for h in range(24):
-            hour_key = f'{h:02d}:00'
-            tide_level = day_data.get(hour_key, '')
-
-            if tide_level != '':
-                # Format: 1 decimal place
-                row.append(f'{float(tide_level):.1f}')
-            else:
-                row.append('')
-
+        row = [str(int(day_data['Date'][8:]))]
+        row += [f'{day_data[key]:.1f}' if key in day_data else '' for key in HOUR_KEYS]
         data.append(row)
 
     return data
 
-def generate_pdf(tide_data, output_file, location="TANJONG PAGAR"):
-    """Generate PDF with tide tables."""
+def build_month_pdf(year_month, month_data, output_file, location):
+    """Build a one-page PDF with the tide table for one month."""
+    year, month = year_month.split('-')
+    month_name = MONTH_NAMES[month]
 
     # Use portrait A4
     doc = SimpleDocTemplate(
@@ -82,140 +158,155 @@ def generate_pdf(tide_data, output_file, location="TANJONG PAGAR"):
         rightMargin=5*mm
     )
 
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=12,
-        textColor=colors.black,
-        spaceAfter=3,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
+    # Title
+    title = Paragraph('HOURLY TIDAL HEIGHTS', TITLE_STYLE)
+    subtitle = Paragraph(f'{location}<br/>{month_name} {year}', SUBTITLE_STYLE)
 
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.black,
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        fontName='Helvetica'
-    )
+    elements = [title, subtitle]
 
-    elements = []
-
-    # Group data by month
-    months_data = group_by_month(tide_data)
-    month_names = {
-        '01': 'JANUARY', '02': 'FEBRUARY', '03': 'MARCH', '04': 'APRIL',
-        '05': 'MAY', '06': 'JUNE', '07': 'JULY', '08': 'AUGUST',
-        '09': 'SEPTEMBER', '10': 'OCTOBER', '11': 'NOVEMBER', '12': 'DECEMBER'
-    }
-
-    # Generate tables for each month
-    for i, (year_month, month_data) in enumerate(sorted(months_data.items())):
-        year, month = year_month.split('-')
-        month_name = month_names[month]
-
-        # Title
-        title = Paragraph(f'HOURLY TIDAL HEIGHTS', title_style)
-        subtitle = Paragraph(f'{location}<br/>{month_name} {year}', subtitle_style)
-
-        elements.append(title)
-        elements.append(subtitle)
-
-        # Create table data
-        table_data = create_month_table(month_data)
-
-        # Calculate column widths for portrait A4
-        page_width = A4[0] - 10*mm  # Total width minus margins
-        day_col_width = 8*mm
-        hour_col_width = (page_width - day_col_width) / 24
-
-        col_widths = [day_col_width] + [hour_col_width] * 24
-
-        # Create table
-        table = Table(table_data, colWidths=col_widths, repeatRows=1)
-
-        # Table styling
-        style_commands = [
-            # Header row
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 6.5),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 1),
-            ('TOPPADDING', (0, 0), (-1, 0), 1),
-
-            # Day column
-            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey),
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (0, -1), 6),
-
-            # Data cells
-            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-            ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (1, 1), (-1, -1), 6),
-            ('TOPPADDING', (1, 1), (-1, -1), 0.8),
-            ('BOTTOMPADDING', (1, 1), (-1, -1), 0.8),
-
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.3, colors.grey),
-            ('LINEBELOW', (0, 0), (-1, 0), 0.8, colors.black),
-            ('LINEAFTER', (0, 0), (0, -1), 0.8, colors.black),
-        ]
-
-        table.setStyle(TableStyle(style_commands))
-
-        elements.append(table)
-
-        # Add footer note
-        footer_text = Paragraph(
-            f'Tide heights in meters relative to chart datum. '
-            f'Generated from official tide predictions.',
-            ParagraphStyle('Footer', fontSize=6.5, textColor=colors.grey, alignment=TA_CENTER)
-        )
-        elements.append(Spacer(1, 3*mm))
-        elements.append(footer_text)
-
-        # Add page break after each month except the last
-        if i < len(months_data) - 1:
-            elements.append(PageBreak())
-
-        print(f'✅ Generated {month_name} {year}')
+    # Create table data
+    table_data = create_month_table(month_data)
+
+    # Create table
+    table = Table(table_data, colWidths=COL_WIDTHS, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+
+    elements.append(table)
+
+    # Add footer note
+    footer_text = Paragraph(
+        f'Tide heights in meters relative to chart datum. '
+        f'Generated from official tide predictions.',
+        FOOTER_STYLE
+    )
+    elements.append(Spacer(1, 3*mm))
+    elements.append(footer_text)
 
     # Build PDF
     doc.build(elements)
 
+def load_cache(cache_file):
+    """Load the month -> content hash cache, or an empty one."""
+    try:
+        with open(cache_file, 'rb') as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict):
+        return {}
+    return {key: value for key, value in cache.items() if isinstance(value, str)}
+
+def generate_pdf(tide_data, output_file, location="TANJONG PAGAR", parallel=False):
+    """
+    Generate PDF with tide tables.
+
+    Each month is built as its own one-page PDF under <output>.cache/ and
+    the pages are merged into the output file. Months whose data (and
+    location and LAYOUT_VERSION) hash matches <output>.cache.json are
+    reused instead of being rebuilt. With parallel=True, changed months are built in a
+    process pool.
+
+    Returns:
+        Tuple of (days, months) written to the PDF
+    """
+    cache_file = output_file + '.cache.json'
+    cache_dir = output_file + '.cache'
+
+    cache = load_cache(cache_file)
+    new_cache = {}
+    pending = []  # (future, message) per month when building in parallel
+    days = 0
+    last_month = None
+
+    # Each month is built (or submitted to the pool) as soon as its group
+    # is read, so only the months in flight are held in memory
+    with ProcessPoolExecutor() if parallel else nullcontext() as executor:
+        # Generate tables for each month (input must be in date order, so
+        # each month forms a single group)
+        for year_month, group in groupby(tide_data, key=lambda day: day['Date'][:7]):
+            if last_month is not None and year_month <= last_month:
+                raise ValueError(f'Input not in date order: {year_month} appears after {last_month}')
+            last_month = year_month
+
+            month_data = list(group)
+            days += len(month_data)
+
+            year, month = year_month.split('-')
+            month_name = MONTH_NAMES[month]
+
+            digest = hashlib.blake2b(
+                json_dumps([LAYOUT_VERSION, location, month_data])
+            ).hexdigest()
+            month_pdf = os.path.join(cache_dir, f'{year_month}.pdf')
+            new_cache[year_month] = digest
+
+            future = None
+            if cache.get(year_month) == digest and os.path.exists(month_pdf):
+                message = f'♻️  Reused {month_name} {year}'
+            else:
+                message = f'✅ Generated {month_name} {year}'
+                os.makedirs(cache_dir, exist_ok=True)
+                if parallel:
+                    future = executor.submit(build_month_pdf, year_month, month_data, month_pdf, location)
+                else:
+                    build_month_pdf(year_month, month_data, month_pdf, location)
+
+            if parallel:
+                pending.append((future, message))
+            else:
+                print(message)
+
+        # Report parallel builds in month order once each has finished
+        for future, message in pending:
+            if future is not None:
+                future.result()
+            print(message)
+
+    # Drop cached pages for months no longer in the data
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.pdf') and name[:-4] not in new_cache:
+                os.remove(os.path.join(cache_dir, name))
+
+    # Merge months into the output PDF
+    writer = PdfWriter()
+    for year_month in new_cache:
+        writer.append(os.path.join(cache_dir, f'{year_month}.pdf'))
+
+    with open(output_file, 'wb') as f:
+        writer.write(f)
+
+    with open(cache_file, 'wb') as f:
+        f.write(json_dumps(new_cache))
+
+    return days, len(new_cache)
+
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python generate_tide_pdf.py input.json output.pdf [location]")
+    args = [arg for arg in sys.argv[1:] if arg != '--parallel']
+    parallel = len(args) < len(sys.argv) - 1
+
+    if len(args) < 2:
+        print("Usage: python generate_tide_pdf.py input.json output.pdf [location] [--parallel]")
         sys.exit(1)
 
-    input_json = sys.argv[1]
-    output_pdf = sys.argv[2]
-    location = sys.argv[3] if len(sys.argv) > 3 else "TANJONG PAGAR"
+    input_json = args[0]
+    output_pdf = args[1]
+    location = args[2] if len(args) > 2 else "TANJONG PAGAR"
 
     print('📊 Generating Tide Table PDF...\n')
 
     try:
-        # Load data
+        # Load data (streamed into the PDF generator)
         tide_data = load_tide_data(input_json)
-        print(f'📈 Loaded {len(tide_data)} days of tide data\n')
 
         # Generate PDF
         print('🔄 Generating tide tables...\n')
-        generate_pdf(tide_data, output_pdf, location)
-
-        # Count months
-        months = len(set(day['Date'][:7] for day in tide_data))
+        days, months = generate_pdf(tide_data, output_pdf, location, parallel)
 
         print('\n🎉 PDF created successfully!')
         print(f'   📁 File: {output_pdf}')
+        print(f'   📈 Days: {days}')
         print(f'   📄 Pages: {months}')
         print(f'   🖨️  Ready to print!')
         print()